@@ -7,6 +7,9 @@ DEFAULT_TIMEOUT_SEC = 2000
 POST_CALL_DELAY_SEC = 5
 LOG_INTERVAL_SEC = 10
 
+# Exact-match LLM response cache (None disables it), e.g. "data/cache/llm"
+LLM_RESPONSE_CACHE_DIR = None
+
 # Concurrent Processing
 MAX_CONCURRENCY = 5
 
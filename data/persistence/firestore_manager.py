@@ -1,4 +1,6 @@
-from typing import Optional, Dict, Any, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Any, Iterator, List, Tuple, TypeVar
 
 # Core experiment collections
 RUNS = "Runs"
@@ -10,10 +12,45 @@ FINAL_JUDGEMENTS = "FinalJudgements"
 METRICS = "Metrics"
 PROBLEMS = "Problems"
 
+# Firestore rejects commits with more than 500 mutations
+MAX_BATCH_SIZE = 500
+
+# Worker threads shared by all blocking Firestore calls of one manager
+DEFAULT_MAX_WORKERS = 40
+
+# Pending write batches before enqueue_many makes producers wait
+DEFAULT_WRITE_QUEUE_SIZE = 64
+
+T = TypeVar("T")
+
 
 class FirestoreManager:
-    def __init__(self, db):
+    def __init__(
+        self,
+        db,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        write_queue_size: int = DEFAULT_WRITE_QUEUE_SIZE,
+    ):
         self.db = db
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="firestore",
+        )
+
+        # (collection, [(document_id, document), ...]) drained by one writer
+        # task; bounded so producers slow down when Firestore falls behind
+        self._write_queue: asyncio.Queue = asyncio.Queue(maxsize=write_queue_size)
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_errors: List[Exception] = []
+
+    async def _run_blocking(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Runs a blocking Firestore client call on the manager's
+        dedicated thread pool instead of the loop's default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
 
     async def write(
         self,
@@ -28,6 +65,19 @@ class FirestoreManager:
         If document_id is provided -> deterministic ID
         Otherwise -> auto-generated ID
         """
+        await self._run_blocking(
+            self._write_sync,
+            collection,
+            document,
+            document_id,
+        )
+
+    def _write_sync(
+        self,
+        collection: str,
+        document: Dict[str, Any],
+        document_id: Optional[str],
+    ) -> None:
         col_ref = self.db.collection(collection)
 
         if document_id:
@@ -35,24 +85,206 @@ class FirestoreManager:
         else:
             col_ref.add(document)
 
+    async def write_many(
+        self,
+        *,
+        collection: str,
+        documents: List[Tuple[str, Dict[str, Any]]],
+    ) -> None:
+        """
+        Writes (document_id, document) pairs to Firestore
+        using batched commits of up to MAX_BATCH_SIZE documents.
+        The commits are independent, so they run concurrently.
+        """
+        col_ref = self.db.collection(collection)
+        batches = []
+
+        for start in range(0, len(documents), MAX_BATCH_SIZE):
+            batch = self.db.batch()
+
+            for document_id, document in documents[start : start + MAX_BATCH_SIZE]:
+                batch.set(col_ref.document(document_id), document)
+
+            batches.append(batch)
+
+        await asyncio.gather(*[self._run_blocking(b.commit) for b in batches])
+
+    # -------------------------
+    # Background write queue
+    # -------------------------
+    async def enqueue_many(
+        self,
+        *,
+        collection: str,
+        documents: List[Tuple[str, Dict[str, Any]]],
+    ) -> None:
+        """
+        Hands (document_id, document) pairs to the background writer.
+        Returns as soon as the queue accepts them, waiting only while
+        it is full. Call flush() before shutdown to make sure
+        everything landed.
+        """
+        if not documents:
+            return
+
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._drain_writes())
+
+        await self._write_queue.put((collection, documents))
+
+    async def flush(self) -> None:
+        """
+        Waits until every enqueued document is processed, then stops
+        the background writer. Raises an ExceptionGroup of every failed
+        commit since the last flush, so lost writes are never silent.
+        """
+        if self._writer_task is not None:
+            await self._write_queue.join()
+
+            writer_task, self._writer_task = self._writer_task, None
+            writer_task.cancel()
+            try:
+                await writer_task
+            except asyncio.CancelledError:
+                pass
+
+        if self._write_errors:
+            errors, self._write_errors = self._write_errors, []
+            raise ExceptionGroup("Firestore writes failed", errors)
+
+    async def _drain_writes(self) -> None:
+        """
+        Commits everything queued since the previous commit as one
+        batched write per collection, so documents that finish while a
+        commit is in flight share the next round-trip.
+        """
+        while True:
+            pending = [await self._write_queue.get()]
+            while not self._write_queue.empty():
+                pending.append(self._write_queue.get_nowait())
+
+            by_collection: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+            for collection, documents in pending:
+                by_collection.setdefault(collection, []).extend(documents)
+
+            for collection, documents in by_collection.items():
+                try:
+                    await self.write_many(
+                        collection=collection,
+                        documents=documents,
+                    )
+                except Exception as e:
+                    print(
+                        f"[WRITE FAILED] collection={collection} "
+                        f"documents={len(documents)} "
+                        f"error={type(e).__name__}: {e}"
+                    )
+                    # reported by flush(); keep committing the rest
+                    self._write_errors.append(e)
+
+            for _ in pending:
+                self._write_queue.task_done()
+
     async def dump_collection(
         self,
         *,
         collection: str,
+        fields: Optional[List[str]] = None,
         include_document_id: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         Dumps all documents from a Firestore collection.
 
         Returns a list of dictionaries.
+        If fields is provided, only those fields are read from Firestore.
         Optionally injects document_id into each record.
+        The blocking stream runs in a worker thread so several
+        dumps can be gathered concurrently.
+        """
+        return await self._run_blocking(
+            self._dump_sync,
+            collection,
+            fields,
+            include_document_id,
+        )
+
+    def _dump_sync(
+        self,
+        collection: str,
+        fields: Optional[List[str]],
+        include_document_id: bool,
+    ) -> List[Dict[str, Any]]:
+        return list(
+            self.stream_collection(
+                collection=collection,
+                fields=fields,
+                include_document_id=include_document_id,
+            )
+        )
+
+    def stream_collection(
+        self,
+        *,
+        collection: str,
+        fields: Optional[List[str]] = None,
+        include_document_id: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
         """
+        Lazily yields documents from a Firestore collection,
+        so callers can aggregate without holding every record.
+
+        If fields is provided, only those fields are read from Firestore.
+        Blocking; run it in a worker thread from async code.
+        """
+        query = self.db.collection(collection)
+
+        if fields:
+            query = query.select(fields)
+
+        for doc in query.stream():
+            data = doc.to_dict()
+            if include_document_id:
+                data["_document_id"] = doc.id
+            yield data
+
+    async def get_many(
+        self,
+        *,
+        collection: str,
+        document_ids: List[str],
+        include_document_id: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches specific documents from a Firestore collection
+        in a single multi-document read.
+
+        Returns a list of dictionaries for the documents that exist.
+        Optionally injects document_id into each record.
+        """
+        return await self._run_blocking(
+            self._get_many_sync,
+            collection,
+            document_ids,
+            include_document_id,
+        )
+
+    def _get_many_sync(
+        self,
+        collection: str,
+        document_ids: List[str],
+        include_document_id: bool,
+    ) -> List[Dict[str, Any]]:
+        if not document_ids:
+            return []
+
         col_ref = self.db.collection(collection)
-        docs = col_ref.stream()
+        refs = [col_ref.document(document_id) for document_id in document_ids]
 
         results: List[Dict[str, Any]] = []
 
-        for doc in docs:
+        for doc in self.db.get_all(refs):
+            if not doc.exists:
+                continue
             data = doc.to_dict()
             if include_document_id:
                 data["_document_id"] = doc.id
@@ -74,4 +306,26 @@ class FirestoreManager:
             raise ValueError("document_id must be provided")
 
         doc_ref = self.db.collection(collection).document(document_id)
-        doc_ref.update(updates)
\ No newline at end of file
+        await self._run_blocking(doc_ref.update, updates)
+
+    async def update_many(
+        self,
+        *,
+        collection: str,
+        updates: List[Tuple[str, Dict[str, Any]]],
+    ) -> None:
+        """
+        Updates fields of existing documents from (document_id, updates) pairs
+        using batched commits of up to MAX_BATCH_SIZE documents.
+        """
+        col_ref = self.db.collection(collection)
+
+        for start in range(0, len(updates), MAX_BATCH_SIZE):
+            batch = self.db.batch()
+
+            for document_id, fields in updates[start : start + MAX_BATCH_SIZE]:
+                if not document_id:
+                    raise ValueError("document_id must be provided")
+                batch.update(col_ref.document(document_id), fields)
+
+            await self._run_blocking(batch.commit)
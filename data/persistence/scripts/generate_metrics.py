@@ -1,4 +1,5 @@
 import asyncio
+import csv
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -8,7 +9,6 @@ from dotenv import load_dotenv
 from data.persistence.firestore_client import get_firestore_client
 from data.persistence.firestore_manager import (
     FirestoreManager,
-    RUNS,
     PROBLEMS,
     SOLUTIONS,
     REFINED_SOLUTIONS,
@@ -26,34 +26,17 @@ def project_and_filter(
     *,
     required: List[str],
     optional: Optional[List[str]] = None,
-) -> List[Dict[str, Any]]:
+) -> pd.DataFrame:
     optional = optional or []
-    rows: List[Dict[str, Any]] = []
 
-    for r in records:
-        if not isinstance(r, dict):
-            continue
-
-        row: Dict[str, Any] = {}
-
-        # required fields
-        valid = True
-        for field in required:
-            if field not in r or r[field] is None:
-                valid = False
-                break
-            row[field] = r[field]
-
-        if not valid:
-            continue
-
-        # optional fields
-        for field in optional:
-            row[field] = r.get(field)
-
-        rows.append(row)
+    # from_records projects onto the given columns and fills missing keys
+    df = pd.DataFrame.from_records(
+        [r for r in records if isinstance(r, dict)],
+        columns=required + optional,
+    )
 
-    return rows
+    # drop rows missing any required field
+    return df.dropna(subset=required).reset_index(drop=True)
 
 
 # -------------------------------------------------
@@ -65,15 +48,46 @@ async def main() -> None:
     db = get_firestore_client()
     firestore = FirestoreManager(db)
 
+    def load_ground_answers() -> Dict[str, Any]:
+        # problems only contribute ground truth, so keep just that lookup
+        return {
+            p["problem_id"]: p.get("ground_answer")
+            for p in firestore.stream_collection(
+                collection=PROBLEMS,
+                fields=["problem_id", "ground_answer"],
+                include_document_id=False,
+            )
+            if p.get("problem_id") is not None
+        }
+
     # ---------------------------------------------
-    # Dump collections (single read each)
+    # Dump collections (single read each, concurrently)
     # ---------------------------------------------
-    runs = await firestore.dump_collection(collection=RUNS)
-    problems = await firestore.dump_collection(collection=PROBLEMS)
-    solutions = await firestore.dump_collection(collection=SOLUTIONS)
-    refined_solutions = await firestore.dump_collection(collection=REFINED_SOLUTIONS)
-    final_judgements = await firestore.dump_collection(collection=FINAL_JUDGEMENTS)
-    role_assesments = await firestore.dump_collection(collection=ROLE_ASSESSMENTS)
+    (
+        ground_answer_by_problem,
+        solutions,
+        refined_solutions,
+        final_judgements,
+        role_assesments,
+    ) = await asyncio.gather(
+        asyncio.to_thread(load_ground_answers),
+        firestore.dump_collection(
+            collection=SOLUTIONS,
+            fields=["run_id", "problem_id", "solution_id", "is_correct_answer", "solver_llm_model_id", "answer"],
+        ),
+        firestore.dump_collection(
+            collection=REFINED_SOLUTIONS,
+            fields=["run_id", "problem_id", "parent_solution_id", "is_correct_answer", "solver_llm_model_id", "refined_answer"],
+        ),
+        firestore.dump_collection(
+            collection=FINAL_JUDGEMENTS,
+            fields=["run_id", "problem_id", "is_correct_answer", "llm_id", "winner_solver_id", "answer"],
+        ),
+        firestore.dump_collection(
+            collection=ROLE_ASSESSMENTS,
+            fields=["run_id", "problem_id", "llm_id", "judge_score", "solver_score"],
+        ),
+    )
 
 
     def write_in_file(df: pd.DataFrame, path: str) -> None:
@@ -87,104 +101,145 @@ async def main() -> None:
             encoding="utf-8",
         )
 
+    def write_row_in_file(row: Dict[str, Any], path: str) -> None:
+        # single-row metric tables don't need a DataFrame round-trip
+        out_path = Path(path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with out_path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=list(row),
+                delimiter="\t",
+                lineterminator="\n",
+            )
+            writer.writeheader()
+            writer.writerow(row)
+
+    llm_id_aliases = {
+        "gemini-3-flash-1": "gpt-5-mini",
+        "gemini-3-pro-1": "gpt-4.1",
+    }
+
     def reshape(df: pd.DataFrame) -> pd.DataFrame:
-        # rename only if present
-        if "solver_llm_model_id" in df.columns:
-            df = df.rename(columns={"solver_llm_model_id": "llm_id"})
+        df = df.rename(columns={"solver_llm_model_id": "llm_id"}, errors="ignore")
 
         # normalize llm_id values only if column exists
         if "llm_id" in df.columns:
-            df["llm_id"] = df["llm_id"].replace({
-                "gemini-3-flash-1": "gpt-5-mini",
-                "gemini-3-pro-1": "gpt-4.1",
-            })
-
-        # drop columns only if they exist
-        cols_to_drop = [c for c in ["prompt_user", "prompt_system", "_document_id", "reasoning"] if c in df.columns]
-        if cols_to_drop:
-            df = df.drop(columns=cols_to_drop)
+            aliased = df["llm_id"].map(llm_id_aliases)
+            df["llm_id"] = aliased.where(aliased.notna(), df["llm_id"])
 
-        return df
+        return df.drop(
+            columns=["prompt_user", "prompt_system", "_document_id", "reasoning"],
+            errors="ignore",
+        )
 
-    df_problems = reshape(pd.DataFrame(problems))[["problem_id", "ground_answer"]]
     df_solutions = reshape(pd.DataFrame(solutions))[["run_id", "problem_id", "solution_id", "is_correct_answer", "llm_id", "answer"]]
     df_refined = reshape(pd.DataFrame(refined_solutions))[["run_id", "problem_id", "parent_solution_id", "is_correct_answer", "llm_id", "refined_answer"]]
     df_final = reshape(pd.DataFrame(final_judgements))[["run_id", "problem_id", "is_correct_answer", "llm_id", "winner_solver_id", "answer"]]
     df_role = reshape(pd.DataFrame(role_assesments))[["run_id", "problem_id", "llm_id", "judge_score", "solver_score"]]
 
-    df_join_1 = df_problems.merge(
-        df_role,
-        on="problem_id",
-        how="left",
-        suffixes=("", "_role"),
+    def to_shared_categories(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        # one categorical dtype for every id column, so merges, groupbys and
+        # llm_id == winner_solver_id comparisons all run on integer codes
+        id_columns = ["run_id", "problem_id", "llm_id", "winner_solver_id"]
+
+        ids = pd.concat(
+            [df[c] for df in frames for c in id_columns if c in df.columns]
+        )
+        id_dtype = pd.CategoricalDtype(categories=sorted(ids.dropna().unique()))
+
+        return [
+            df.astype({c: id_dtype for c in id_columns if c in df.columns})
+            for df in frames
+        ]
+
+    df_solutions, df_refined, df_final, df_role = to_shared_categories(
+        [df_solutions, df_refined, df_final, df_role]
     )
+
+    # ground truth is a one-column lookup, so map it instead of merging frames
+    ground_answers = pd.Series(ground_answer_by_problem, name="ground_answer", dtype=object)
+
+    df_join_1 = df_role.assign(
+        ground_answer=df_role["problem_id"].map(ground_answers)
+    )[["problem_id", "ground_answer", "run_id", "llm_id", "judge_score", "solver_score"]]
     write_in_file(df_join_1, "../../metrics/debug/join1.tsv")
     write_in_file(df_final, "../../metrics/debug/final.tsv")
 
-    df_join_2 = df_join_1.merge(
-        df_solutions,
-        on=["problem_id", "run_id", "llm_id"],
-        how="inner",
-        suffixes=("", "_solution"),
-    )
-
-    df_join_3 = df_join_2.merge(
-        df_refined,
-        on=["problem_id", "run_id", "llm_id"],
-        how="inner",
-        suffixes=("", "_refined"),
+    # join solver artifacts on (problem, run, llm) indexes. Keys can repeat
+    # (e.g. re-run problems within a run), so these stay many-to-many
+    # joins exactly like the original merges. Answers and lineage are
+    # carried here, since joining them again on the same keys would
+    # multiply the duplicated rows.
+    solver_keys = ["problem_id", "run_id", "llm_id"]
+
+    df_join_3 = (
+        df_role.set_index(solver_keys)
+        .join(
+            df_solutions.set_index(solver_keys)[
+                ["solution_id", "is_correct_answer", "answer"]
+            ],
+            how="inner",
+        )
+        .join(
+            df_refined.set_index(solver_keys)[
+                ["parent_solution_id", "is_correct_answer", "refined_answer"]
+            ],
+            how="inner",
+            rsuffix="_refined",
+        )
+        .reset_index()
     )
 
     TOTAL = 22
 
-    df_join_3 = df_join_3.merge(
-        df_final[["run_id", "problem_id", "winner_solver_id"]],
-        on=["run_id", "problem_id"],
-        how="left",
-    )
+    # winner is a per-(run, problem) lookup against the final judgements
+    winners = df_final.set_index(["run_id", "problem_id"])["winner_solver_id"]
+    df_join_3 = df_join_3.join(winners, on=["run_id", "problem_id"])
 
-    df_join_3["is_judge_selected_context"] = (
-            df_join_3["llm_id"] == df_join_3["winner_solver_id"]
-    )
+    # both columns share id_dtype, so equal codes mean equal ids (-1 is missing)
+    llm_codes = df_join_3["llm_id"].cat.codes.to_numpy()
+    winner_codes = df_join_3["winner_solver_id"].cat.codes.to_numpy()
+    df_join_3["is_judge_selected_context"] = (llm_codes == winner_codes) & (winner_codes != -1)
 
     # optional: drop helper column if you truly want nothing else
     df_join_4 = df_join_3.drop(columns=["winner_solver_id"])
-    write_in_file(df_join_4, "../../metrics/debug/grounded.tsv")
+
+    # ground truth is one value per problem, so this join never adds rows
+    df_grounded = df_join_4.join(ground_answers, on="problem_id")
+    write_in_file(df_grounded, "../../metrics/debug/grounded.tsv")
+
+    # precompute per-row transition flags so .agg only uses native reductions
+    original_correct = df_join_3["is_correct_answer"]
+    refined_correct = df_join_3["is_correct_answer_refined"]
 
     df_llm_summary = (
         df_join_3
-        .groupby("llm_id", as_index=False)
+        .assign(
+            judge_selected_correct=(
+                df_join_3["is_judge_selected_context"].eq(True) & refined_correct.eq(True)
+            ),
+            true_to_false=original_correct.eq(True) & refined_correct.eq(False),
+            false_to_true=original_correct.eq(False) & refined_correct.eq(True),
+        )
+        .groupby("llm_id", as_index=False, observed=True)
         .agg(
             solver_role=("solution_id", "count"),
             correct_answers_count=("is_correct_answer", "sum"),
             refined_correct_answers_count=("is_correct_answer_refined", "sum"),
             judge_selected_agent_count=("is_judge_selected_context", "sum"),
-            judge_score_mean=("judge_score", lambda x: round(x.mean(), 2)),
-            solver_score_mean=("solver_score", lambda x: round(x.mean(), 2)),
-            judge_selected_agent_correct_answer_count=(
-                "is_judge_selected_context",
-                lambda x: (
-                        (x == True)
-                        & (df_join_3.loc[x.index, "is_correct_answer_refined"] == True)
-                ).sum()
-            ),
-            true_to_false_change=(
-                "is_correct_answer",
-                lambda x: (
-                        (x == True)
-                        & (df_join_3.loc[x.index, "is_correct_answer_refined"] == False)
-                ).sum()
-            ),
-            false_to_true_change=(
-                "is_correct_answer",
-                lambda x: (
-                        (x == False)
-                        & (df_join_3.loc[x.index, "is_correct_answer_refined"] == True)
-                ).sum()
-            ),
+            judge_score_mean=("judge_score", "mean"),
+            solver_score_mean=("solver_score", "mean"),
+            judge_selected_agent_correct_answer_count=("judge_selected_correct", "sum"),
+            true_to_false_change=("true_to_false", "sum"),
+            false_to_true_change=("false_to_true", "sum"),
         )
     )
 
+    score_columns = ["judge_score_mean", "solver_score_mean"]
+    df_llm_summary[score_columns] = df_llm_summary[score_columns].round(2)
+
     df_llm_summary["total"] = TOTAL
     df_llm_summary["judge_role"] = TOTAL - df_llm_summary["solver_role"]
     write_in_file(df_llm_summary, "../../metrics/agent_level_metrics.tsv")
@@ -203,75 +258,54 @@ async def main() -> None:
         .mean()
     )
 
-    df_solution_accuracy_metrics = pd.DataFrame([{
+    write_row_in_file({
         "original_solution_accuracy": round(original_solution_accuracy, 3),
         "refined_solution_accuracy": round(refined_solution_accuracy, 3),
         "judged_solution_accuracy": round(judged_solution_accuracy, 3),
-    }])
-    write_in_file(df_solution_accuracy_metrics, "../../metrics/overall_accuracy_metrics.tsv")
+    }, "../../metrics/overall_accuracy_metrics.tsv")
 
-    true_to_false_rate = (
-        (df_join_4["is_correct_answer"] & ~df_join_4["is_correct_answer_refined"])
-        .mean()
-    )
+    # plain numpy bool arrays skip pandas' masked/aligned boolean path
+    original_correct_flags = df_join_4["is_correct_answer"].to_numpy(dtype=bool)
+    refined_correct_flags = df_join_4["is_correct_answer_refined"].to_numpy(dtype=bool)
 
-    false_to_true_rate = (
-        (~df_join_4["is_correct_answer"] & df_join_4["is_correct_answer_refined"])
-        .mean()
-    )
+    true_to_false_rate = (original_correct_flags & ~refined_correct_flags).mean()
+    false_to_true_rate = (~original_correct_flags & refined_correct_flags).mean()
 
-    df_refinement_transition_metrics = pd.DataFrame([{
+    write_row_in_file({
         "true_to_false_rate": round(true_to_false_rate, 3),
         "false_to_true_rate": round(false_to_true_rate, 3),
-    }])
-    write_in_file(df_refinement_transition_metrics, "../../metrics/refinement_transition_metrics.tsv")
-
-    consensus_rate3 = (
-        df_join_4
-        .groupby(["run_id", "problem_id"])["refined_answer"]
-        .agg(lambda x: x.nunique() == 1)
-        .mean()
-    )
-    consensus_rate2 = (
-        df_join_4
-        .groupby(["run_id", "problem_id"])["refined_answer"]
-        .agg(lambda x: x.nunique() == 2)
-        .mean()
-    )
-    consensus_rate1 = (
-        df_join_4
-        .groupby(["run_id", "problem_id"])["refined_answer"]
-        .agg(lambda x: x.nunique() == 3)
-        .mean()
-    )
-    df_refinement_transition_metrics = pd.DataFrame([{
+    }, "../../metrics/refinement_transition_metrics.tsv")
+
+    # (run, problem) grouping shared by the consensus and judge metrics
+    run_problem_keys = ["run_id", "problem_id"]
+    run_problem_groups = df_join_4.groupby(run_problem_keys, sort=False, observed=True)
+
+    # distinct refined answers per (run, problem), computed once
+    refined_answer_nunique = run_problem_groups["refined_answer"].nunique()
+    consensus_rate3 = (refined_answer_nunique == 1).mean()
+    consensus_rate2 = (refined_answer_nunique == 2).mean()
+    consensus_rate1 = (refined_answer_nunique == 3).mean()
+    write_row_in_file({
         "consensus_rate3": round(consensus_rate3, 3),
         "consensus_rate2": round(consensus_rate2, 3),
         "consensus_rate1": round(consensus_rate1, 3),
-    }])
-    write_in_file(df_refinement_transition_metrics, "../../metrics/consensus_metrics.tsv")
-
-    judge_eval = (
-        df_join_4
-        .groupby(
-            ["run_id", "problem_id"]
-        )[
-            ["is_correct_answer_refined", "is_judge_selected_context"]
-        ]
-        .apply(
-            lambda g: pd.Series({
-                "has_disagreement": g["is_correct_answer_refined"].nunique() > 1,
-                "judge_correct": (
-                        g["is_correct_answer_refined"].nunique() > 1
-                        and g.loc[
-                            g["is_judge_selected_context"],
-                            "is_correct_answer_refined"
-                        ].any()
-                )
-            })
-        )
+    }, "../../metrics/consensus_metrics.tsv")
+
+    has_disagreement = run_problem_groups["is_correct_answer_refined"].nunique() > 1
+
+    judge_selected_correct = (
+        df_join_4[df_join_4["is_judge_selected_context"]]
+        .groupby(run_problem_keys, sort=False, observed=True)["is_correct_answer_refined"]
+        .any()
+        .reindex(has_disagreement.index, fill_value=False)
+        .astype(bool)
     )
 
+    judge_eval = pd.DataFrame({
+        "has_disagreement": has_disagreement,
+        "judge_correct": has_disagreement & judge_selected_correct,
+    })
+
     # -------------------------------------------------
     # Aggregate counts + accuracy
     # -------------------------------------------------
@@ -287,13 +321,11 @@ async def main() -> None:
     # -------------------------------------------------
     # Final metrics table
     # -------------------------------------------------
-    df_refinement_transition_metrics = pd.DataFrame([{
+    write_row_in_file({
         "judge_accuracy_at_disagreement": round(judge_accuracy, 3),
         "judge_correct_cases": judge_correct_cases,
         "judge_disagreement_cases": judge_disagreement_cases,
-    }])
-
-    write_in_file(df_refinement_transition_metrics, "../../metrics/judge_accuracy_dissagreement.tsv")
+    }, "../../metrics/judge_accuracy_dissagreement.tsv")
 
 
 if __name__ == "__main__":
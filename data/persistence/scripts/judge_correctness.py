@@ -1,5 +1,5 @@
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
@@ -9,6 +9,7 @@ from data.persistence.firestore_manager import (
     FirestoreManager,
     PROBLEMS,
     FINAL_JUDGEMENTS, SOLUTIONS, REFINED_SOLUTIONS,
+    MAX_BATCH_SIZE,
 )
 
 from llm.agents.agent_factory import AgentFactory
@@ -91,10 +92,9 @@ async def process_judgement(
     judgement: Dict[str, Any],
     problem_map: Dict[str, Dict[str, str]],
     agent,
-    firestore: FirestoreManager,
     system_prompt: str,
     semaphore: asyncio.Semaphore,
-) -> bool:
+) -> Optional[Tuple[str, bool]]:
     async with semaphore:
         try:
             problem_id = judgement.get("problem_id")
@@ -102,11 +102,11 @@ async def process_judgement(
             answer = judgement.get("refined_answer")
 
             if not problem_id or not judgement_id or not answer:
-                return False
+                return None
 
             problem = problem_map.get(problem_id)
             if not problem:
-                return False
+                return None
 
             inp = AnswerComparisonInput(
                 problem=problem["statement"],
@@ -122,19 +122,53 @@ async def process_judgement(
                 method_type="none",
             )
 
-            await firestore.update_document(
+            return judgement_id, result.is_correct
+
+        except Exception as e:
+            print(f"[SKIP] judgement={judgement.get('judgement_id')} err={e}")
+            return None
+
+
+# =================================================
+# VERDICT PERSISTENCE
+# =================================================
+async def persist_verdicts(
+    *,
+    firestore: FirestoreManager,
+    verdicts: List[Tuple[str, Dict[str, Any]]],
+) -> int:
+    """
+    Writes verdicts in batched commits. A failed chunk falls back to
+    per-document updates, so one bad document only skips itself and
+    never the paid-for verdicts around it. Returns the number written.
+    """
+    updated = 0
+
+    for start in range(0, len(verdicts), MAX_BATCH_SIZE):
+        chunk = verdicts[start : start + MAX_BATCH_SIZE]
+
+        try:
+            await firestore.update_many(
                 collection=FINAL_JUDGEMENTS,
-                document_id=judgement_id,
-                updates={
-                    "is_correct_answer": result.is_correct,
-                },
+                updates=chunk,
             )
+            updated += len(chunk)
+            continue
+        except Exception as e:
+            print(f"[BATCH FAILED] verdicts={len(chunk)} err={e} (retrying per document)")
 
-            return True
+        for judgement_id, updates in chunk:
+            try:
+                await firestore.update_document(
+                    collection=FINAL_JUDGEMENTS,
+                    document_id=judgement_id,
+                    updates=updates,
+                )
+                updated += 1
+            except Exception as e:
+                print(f"[SKIP] judgement={judgement_id} err={e}")
 
-        except Exception as e:
-            print(f"[SKIP] judgement={judgement.get('judgement_id')} err={e}")
-            return False
+    return updated
 
 
 # =================================================
@@ -156,14 +190,18 @@ async def main() -> None:
         )
     )
 
-    problems: List[Dict[str, Any]] = await firestore.dump_collection(
-        collection=PROBLEMS
-    )
-
     solutions: List[Dict[str, Any]] = await firestore.dump_collection(
         collection=FINAL_JUDGEMENTS
     )
 
+    # only fetch the problems referenced by the judgements
+    problem_ids = sorted({s["problem_id"] for s in solutions if s.get("problem_id")})
+
+    problems: List[Dict[str, Any]] = await firestore.get_many(
+        collection=PROBLEMS,
+        document_ids=problem_ids,
+    )
+
     # ---------------------------------------------
     # Build problem lookup
     # ---------------------------------------------
@@ -182,7 +220,7 @@ async def main() -> None:
     # EXPECTATION:
     # dump_collection() MUST include Firestore doc id as "__id__"
     # If your key is different, change HERE only.
-    FIXED = 0
+    fixes: List[Tuple[str, Dict[str, Any]]] = []
 
     for j in solutions:
         doc_id = j.get("__id__")  # 🔴 CHANGE IF NEEDED
@@ -193,18 +231,15 @@ async def main() -> None:
         # overwrite broken field in memory
         j["refined_solution_id"] = doc_id
 
-        # persist fix for future sanity
-        await firestore.update_document(
-            collection=SOLUTIONS,
-            document_id=doc_id,
-            updates={
-                "refined_solution_id": doc_id,
-            },
-        )
+        fixes.append((doc_id, {"refined_solution_id": doc_id}))
 
-        FIXED += 1
+    # persist fix for future sanity (batched commits)
+    await firestore.update_many(
+        collection=SOLUTIONS,
+        updates=fixes,
+    )
 
-    print(f"Fixed refined_solution_id for {FIXED} documents")
+    print(f"Fixed refined_solution_id for {len(fixes)} documents")
 
     # ---------------------------------------------
     # Run async correctness judging
@@ -217,7 +252,6 @@ async def main() -> None:
             judgement=j,
             problem_map=problem_map,
             agent=agent,
-            firestore=firestore,
             system_prompt=system_prompt,
             semaphore=semaphore,
         )
@@ -226,7 +260,13 @@ async def main() -> None:
 
     results = await asyncio.gather(*tasks)
 
-    updated = sum(1 for r in results if r)
+    # persist all verdicts in batched commits; failures only skip themselves
+    verdicts = [
+        (judgement_id, {"is_correct_answer": is_correct})
+        for judgement_id, is_correct in filter(None, results)
+    ]
+
+    updated = await persist_verdicts(firestore=firestore, verdicts=verdicts)
     skipped = len(results) - updated
 
     print(f"Done. Updated={updated}, Skipped={skipped}")
@@ -1,7 +1,8 @@
 import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from dotenv import load_dotenv
 
@@ -38,6 +39,32 @@ def extract_ids(filename: str) -> Dict[str, str]:
     raise ValueError(f"Cannot extract ids from filename: {filename}")
 
 
+def load_judgement(path: Path) -> Dict[str, Any]:
+    data = load_json(path)
+
+    # -------------------------------
+    # Recover foreign keys
+    # -------------------------------
+    if "problem_id" not in data or "run_id" not in data:
+        ids = extract_ids(path.name)
+        data["problem_id"] = data.get("problem_id") or ids["problem_id"]
+        data["run_id"] = data.get("run_id") or ids["run_id"]
+
+    # Optional but recommended
+    if "judgement_id" not in data:
+        data["judgement_id"] = path.stem
+
+    # -------------------------------
+    # Hard validation (fail fast)
+    # -------------------------------
+    required = ["problem_id", "run_id", "answer", "confidence"]
+    for r in required:
+        if r not in data or data[r] is None:
+            raise ValueError(f"Missing required field '{r}'")
+
+    return data
+
+
 async def main() -> None:
     load_dotenv()
 
@@ -50,49 +77,31 @@ async def main() -> None:
         print("No final judgement files found.")
         return
 
-    written = 0
+    documents: List[Tuple[str, Dict[str, Any]]] = []
     skipped = 0
 
-    for path in files:
+    # parse files concurrently; file I/O releases the GIL
+    with ThreadPoolExecutor() as executor:
+        futures = [(path, executor.submit(load_judgement, path)) for path in files]
+
+    for path, future in futures:
         try:
-            data = load_json(path)
-
-            # -------------------------------
-            # Recover foreign keys
-            # -------------------------------
-            if "problem_id" not in data or "run_id" not in data:
-                ids = extract_ids(path.name)
-                data["problem_id"] = data.get("problem_id") or ids["problem_id"]
-                data["run_id"] = data.get("run_id") or ids["run_id"]
-
-            # Optional but recommended
-            if "judgement_id" not in data:
-                data["judgement_id"] = path.stem
-
-            # -------------------------------
-            # Hard validation (fail fast)
-            # -------------------------------
-            required = ["problem_id", "run_id", "answer", "confidence"]
-            for r in required:
-                if r not in data or data[r] is None:
-                    raise ValueError(f"Missing required field '{r}'")
-
-            # -------------------------------
-            # Write to Firestore (FIXED)
-            # -------------------------------
-            await firestore.write(
-                collection=FINAL_JUDGEMENTS,
-                document=data,
-                document_id=data["judgement_id"]
-            )
-
-            written += 1
+            data = future.result()
+            documents.append((data["judgement_id"], data))
 
         except Exception as e:
             skipped += 1
             print(f"[SKIP] {path.name}: {e}")
 
-    print(f"Rehydration done. Written={written}, Skipped={skipped}")
+    # -------------------------------
+    # Write to Firestore (batched)
+    # -------------------------------
+    await firestore.write_many(
+        collection=FINAL_JUDGEMENTS,
+        documents=documents,
+    )
+
+    print(f"Rehydration done. Written={len(documents)}, Skipped={skipped}")
 
 
 if __name__ == "__main__":
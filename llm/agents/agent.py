@@ -1,18 +1,88 @@
 from abc import ABC, abstractmethod
 import asyncio
+from functools import lru_cache
+import hashlib
+import itertools
+import os
+from pathlib import Path
+import tempfile
 import time
-from typing import TypeVar, Optional
+from typing import Dict, Tuple, TypeVar, Optional
 
 from schemas.pydantic.input.problem import Problem
 from schemas.dataclass.agent_config import LLMAgentConfig
 from pydantic import BaseModel
+import orjson
 
 T = TypeVar("T", bound=BaseModel)
 
+# call_id -> (llm_id, method_type, instance_id, start_time) of running calls
+_IN_FLIGHT: Dict[int, Tuple[str, str, str, float]] = {}
+_CALL_IDS = itertools.count()
+_heartbeat_task: Optional[asyncio.Task] = None
+
+# call key -> future of the identical call currently running
+_PENDING_CALLS: Dict[str, asyncio.Future] = {}
+
+
+async def _heartbeat(interval_sec: float) -> None:
+    """
+    Single progress logger for every in-flight LLM call.
+    Exits once nothing is in flight; the next call restarts it.
+    """
+    global _heartbeat_task
+
+    try:
+        while _IN_FLIGHT:
+            now = time.monotonic()
+            for llm_id, method_type, instance_id, start_time in list(
+                _IN_FLIGHT.values()
+            ):
+                print(
+                    f"[thinking] agent={llm_id} "
+                    f"method={method_type} "
+                    f"instance={instance_id} "
+                    f"elapsed={now - start_time:.1f}s"
+                )
+            await asyncio.sleep(interval_sec)
+    finally:
+        _heartbeat_task = None
+
+
+def _ensure_heartbeat(interval_sec: float) -> None:
+    global _heartbeat_task
+
+    if _heartbeat_task is None or _heartbeat_task.done():
+        _heartbeat_task = asyncio.create_task(_heartbeat(interval_sec))
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    """
+    Writes to a temp file in the same directory and renames it into
+    place, so an interrupted write never leaves a truncated file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
 
 class LLMAgent(ABC):
-    def __init__(self, *, config: LLMAgentConfig):
+    def __init__(
+        self,
+        *,
+        config: LLMAgentConfig,
+        response_cache_dir: Optional[Path] = None,
+    ):
         self.config = config
+        self.response_cache_dir = response_cache_dir
+
+        if self.response_cache_dir is not None:
+            self.response_cache_dir.mkdir(parents=True, exist_ok=True)
 
     async def run_structured_call(
         self,
@@ -50,24 +120,124 @@ class LLMAgent(ABC):
         max_retries: int,
         post_call_delay_sec: float = 5,
     ) -> Optional[T]:
+        """
+        Coalesces identical concurrent deterministic calls: agents sharing
+        model, temperature 0 and prompts await the call already in flight
+        and receive their own copy of its result. Sampled calls always go
+        to the provider, since each one is meant to be an independent draw.
+        """
 
-        start_time = time.monotonic()
+        call_key = self._call_key(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            output_model=output_model,
+        )
+
+        if self.config.temperature != 0:
+            return await self._call_with_retries(
+                call_key=call_key,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                output_model=output_model,
+                timeout_sec=timeout_sec,
+                log_interval_sec=log_interval_sec,
+                instance_id=instance_id,
+                method_type=method_type,
+                max_retries=max_retries,
+                post_call_delay_sec=post_call_delay_sec,
+            )
 
-        async def log_progress():
+        pending = _PENDING_CALLS.get(call_key)
+        if pending is not None:
+            print(
+                f"[coalesced] agent={self.config.llm_id} "
+                f"method={method_type} "
+                f"instance={instance_id}"
+            )
+            shared = await asyncio.shield(pending)
+            return None if shared is None else shared.model_copy(deep=True)
+
+        future = asyncio.get_running_loop().create_future()
+        _PENDING_CALLS[call_key] = future
+
+        try:
+            result = await self._call_with_retries(
+                call_key=call_key,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                output_model=output_model,
+                timeout_sec=timeout_sec,
+                log_interval_sec=log_interval_sec,
+                instance_id=instance_id,
+                method_type=method_type,
+                max_retries=max_retries,
+                post_call_delay_sec=post_call_delay_sec,
+            )
+        except Exception as e:
+            # waiters see the leader's real error, not a CancelledError
+            future.set_exception(e)
+            # mark retrieved so an unawaited future doesn't log it again
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            _PENDING_CALLS.pop(call_key, None)
+
+        future.set_result(result)
+        return result
+
+    async def _call_with_retries(
+        self,
+        *,
+        call_key: str,
+        system_prompt: str,
+        user_prompt: str,
+        output_model: type[T],
+        timeout_sec: int,
+        log_interval_sec: int,
+        instance_id: str,
+        method_type: str,
+        max_retries: int,
+        post_call_delay_sec: float,
+    ) -> Optional[T]:
+
+        cache_path = (
+            None
+            if self.response_cache_dir is None
+            else self.response_cache_dir / f"{call_key}.json"
+        )
+
+        if cache_path is not None and cache_path.exists():
             try:
-                while True:
-                    elapsed = time.monotonic() - start_time
-                    print(
-                        f"[thinking] agent={self.config.llm_id} "
-                        f"method={method_type} "
-                        f"instance={instance_id} "
-                        f"elapsed={elapsed:.1f}s"
-                    )
-                    await asyncio.sleep(log_interval_sec)
-            except asyncio.CancelledError:
-                pass
+                cached = output_model.model_validate_json(cache_path.read_bytes())
+            except (OSError, ValueError) as e:
+                # unreadable or stale entry: call the provider and overwrite it
+                print(
+                    f"[cache invalid] agent={self.config.llm_id} "
+                    f"method={method_type} "
+                    f"instance={instance_id} "
+                    f"error={type(e).__name__}"
+                )
+            else:
+                print(
+                    f"[cache hit] agent={self.config.llm_id} "
+                    f"method={method_type} "
+                    f"instance={instance_id}"
+                )
+                return cached
+
+        start_time = time.monotonic()
 
-        progress_task = asyncio.create_task(log_progress())
+        call_id = next(_CALL_IDS)
+        _IN_FLIGHT[call_id] = (
+            self.config.llm_id,
+            method_type,
+            instance_id,
+            start_time,
+        )
+        _ensure_heartbeat(log_interval_sec)
 
         try:
             last_exception: Exception | None = None
@@ -75,8 +245,7 @@ class LLMAgent(ABC):
             for attempt in range(1, max_retries + 1):
                 try:
                     result: T = await asyncio.wait_for(
-                        asyncio.to_thread(
-                            self._call_provider,
+                        self._call_provider_async(
                             system_prompt=system_prompt,
                             user_prompt=user_prompt,
                             output_model=output_model,
@@ -86,12 +255,6 @@ class LLMAgent(ABC):
                         timeout=timeout_sec,
                     )
 
-                    elapsed = time.monotonic() - start_time
-                    if hasattr(result, "time_elapsed_sec"):
-                        result.time_elapsed_sec = elapsed
-
-                    return result
-
                 except Exception as e:
                     last_exception = e
                     print(
@@ -105,6 +268,26 @@ class LLMAgent(ABC):
                     # small linear backoff
                     await asyncio.sleep(2 * attempt)
 
+                else:
+                    elapsed = time.monotonic() - start_time
+                    if hasattr(result, "time_elapsed_sec"):
+                        result.time_elapsed_sec = elapsed
+
+                    # outside the retry handler: a failed cache write must
+                    # never resend a call the provider already answered
+                    if cache_path is not None and result is not None:
+                        try:
+                            _write_atomic(cache_path, result.model_dump_json())
+                        except Exception as e:
+                            print(
+                                f"[cache write failed] agent={self.config.llm_id} "
+                                f"method={method_type} "
+                                f"instance={instance_id} "
+                                f"error={type(e).__name__}: {e}"
+                            )
+
+                    return result
+
             # all retries failed
             print(
                 f"[failed] agent={self.config.llm_id} "
@@ -120,7 +303,7 @@ class LLMAgent(ABC):
                 return None
 
         finally:
-            progress_task.cancel()
+            _IN_FLIGHT.pop(call_id, None)
             if post_call_delay_sec > 0:
                 await asyncio.sleep(post_call_delay_sec)
 
@@ -140,6 +323,61 @@ class LLMAgent(ABC):
 
         return kwargs
 
+    def _call_key(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        output_model: type[BaseModel],
+    ) -> str:
+        """
+        Digest of everything that shapes a response: model, sampling
+        parameters, both prompts and the output schema.
+        Used for in-flight coalescing and as the response cache file name.
+        """
+        key = orjson.dumps(
+            [
+                self.config.model,
+                self.config.temperature,
+                self.config.top_p,
+                system_prompt,
+                user_prompt,
+                output_model.__name__,
+            ]
+        )
+        return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _output_json_schema(output_model: type[BaseModel]) -> dict:
+        """
+        JSON schema of an output model, built once per model class.
+        Output models form a small closed set, so the cache stays tiny.
+        """
+        return output_model.model_json_schema()
+
+    async def _call_provider_async(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        output_model: type[T],
+        method_type: str,
+        instance_id: str,
+    ) -> T:
+        """
+        Awaitable provider call. Runs the blocking _call_provider in a
+        worker thread; providers with a native async client override it.
+        """
+        return await asyncio.to_thread(
+            self._call_provider,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            output_model=output_model,
+            method_type=method_type,
+            instance_id=instance_id,
+        )
+
     @abstractmethod
     def _call_provider(
         self,
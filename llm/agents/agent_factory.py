@@ -1,4 +1,5 @@
-from typing import Iterable, List
+from pathlib import Path
+from typing import Iterable, List, Optional
 
 from llm.agents.agent import LLMAgent
 from llm.agents.openai_agent import OpenAIAgent
@@ -10,25 +11,32 @@ from llm.clients.provider_registry import ProviderClientRegistry
 
 class AgentFactory:
     @staticmethod
-    def create_agent(config: LLMAgentConfig) -> LLMAgent:
+    def create_agent(
+        config: LLMAgentConfig,
+        *,
+        response_cache_dir: Optional[Path] = None,
+    ) -> LLMAgent:
         provider = config.provider.lower()
 
         if provider == "openai":
             return OpenAIAgent(
                 client=ProviderClientRegistry.get_openai_client(),
                 config=config,
+                response_cache_dir=response_cache_dir,
             )
 
         if provider == "gemini":
             return GeminiAgent(
                 client=ProviderClientRegistry.get_gemini_client(),
                 config=config,
+                response_cache_dir=response_cache_dir,
             )
         
         if provider == "deepseek":
             return DeepSeekAgent(
                 client=ProviderClientRegistry.get_deepseek_client(),
                 config=config,
+                response_cache_dir=response_cache_dir,
             )
 
         raise ValueError(
@@ -40,5 +48,10 @@ class AgentFactory:
     def create_agents(
         cls,
         configs: Iterable[LLMAgentConfig],
+        *,
+        response_cache_dir: Optional[Path] = None,
     ) -> List[LLMAgent]:
-        return [cls.create_agent(cfg) for cfg in configs]
+        return [
+            cls.create_agent(cfg, response_cache_dir=response_cache_dir)
+            for cfg in configs
+        ]
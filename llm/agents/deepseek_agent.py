@@ -7,8 +7,8 @@ T = TypeVar("T", bound=BaseModel)
 
 
 class DeepSeekAgent(LLMAgent):
-    def __init__(self, *, client, config):
-        super().__init__(config=config)
+    def __init__(self, *, client, config, response_cache_dir=None):
+        super().__init__(config=config, response_cache_dir=response_cache_dir)
         self.client = client
 
     def _call_provider(
@@ -32,12 +32,14 @@ class DeepSeekAgent(LLMAgent):
             **gen_kwargs,
         )
 
+        # ids and size only: dumping multi-KB payloads serializes every
+        # concurrent call on the stdout lock
         print(
-            f"\n[RAW DEEPSEEK OUTPUT] "
+            f"[RAW DEEPSEEK OUTPUT] "
             f"agent={self.config.llm_id} "
             f"method={method_type} "
-            f"instance={instance_id}\n"
-            f"{response.choices[0].message.content}\n"
+            f"instance={instance_id} "
+            f"chars={len(response.choices[0].message.content or '')}"
         )
 
         return response.choices[0].message.parsed
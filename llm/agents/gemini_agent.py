@@ -1,4 +1,6 @@
-from typing import TypeVar
+import time
+from typing import Dict, List, TypeVar
+import orjson
 from llm.agents.agent import LLMAgent
 from pydantic import BaseModel
 
@@ -6,10 +8,13 @@ T = TypeVar("T", bound=BaseModel)
 
 
 class GeminiAgent(LLMAgent):
-    def __init__(self, *, client, config):
-        super().__init__(config=config)
+    def __init__(self, *, client, config, response_cache_dir=None):
+        super().__init__(config=config, response_cache_dir=response_cache_dir)
         self.client = client
 
+        # output model -> generation config shared by every call for it
+        self._config_templates: Dict[type[BaseModel], dict] = {}
+
     def _call_provider(
         self,
         *,
@@ -19,19 +24,92 @@ class GeminiAgent(LLMAgent):
         method_type: str,
         instance_id: str,
     ) -> T:
-        gen_kwargs = self._build_generation_kwargs()
-
         response = self.client.models.generate_content(
-            model=self.config.model,
-            contents=[
-                {"role": "system", "parts": [{"text": system_prompt}]},
+            **self._request_kwargs(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                output_model=output_model,
+            )
+        )
+
+        return output_model.model_validate(orjson.loads(response.text))
+
+    async def _call_provider_async(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        output_model: type[T],
+        method_type: str,
+        instance_id: str,
+    ) -> T:
+        """
+        Native async call through client.aio, so Gemini requests
+        don't occupy a worker thread while waiting on the model.
+        The response is streamed and assembled as chunks arrive,
+        so parsing starts as soon as the last chunk lands.
+        """
+        start_time = time.monotonic()
+        chunks: List[str] = []
+
+        stream = await self.client.aio.models.generate_content_stream(
+            **self._request_kwargs(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                output_model=output_model,
+            )
+        )
+
+        async for chunk in stream:
+            if not chunk.text:
+                continue
+
+            if not chunks:
+                print(
+                    f"[first token] agent={self.config.llm_id} "
+                    f"method={method_type} "
+                    f"instance={instance_id} "
+                    f"elapsed={time.monotonic() - start_time:.1f}s"
+                )
+
+            chunks.append(chunk.text)
+
+        return output_model.model_validate(orjson.loads("".join(chunks)))
+
+    def _request_kwargs(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        output_model: type[T],
+    ) -> dict:
+        return {
+            "model": self.config.model,
+            "contents": [
                 {"role": "user", "parts": [{"text": user_prompt}]},
             ],
-            config={
-                **gen_kwargs,
-                "response_mime_type": "application/json",
-                "response_json_schema": output_model.model_json_schema(),
+            "config": {
+                **self._config_template(output_model),
+                # Sent as a stable instruction prefix so Gemini can reuse
+                # its implicit prompt cache across calls sharing the prompt.
+                "system_instruction": system_prompt,
             },
-        )
+        }
+
+    def _config_template(self, output_model: type[T]) -> dict:
+        """
+        Generation config that only depends on the agent config and the
+        output model, built on first use and reused for later calls.
+        Callers copy it before adding per-call fields.
+        """
+        template = self._config_templates.get(output_model)
+
+        if template is None:
+            template = {
+                **self._build_generation_kwargs(),
+                "response_mime_type": "application/json",
+                "response_json_schema": self._output_json_schema(output_model),
+            }
+            self._config_templates[output_model] = template
 
-        return output_model.model_validate_json(response.text)
+        return template
@@ -7,8 +7,8 @@ T = TypeVar("T", bound=BaseModel)
 
 
 class OpenAIAgent(LLMAgent):
-    def __init__(self, *, client, config):
-        super().__init__(config=config)
+    def __init__(self, *, client, config, response_cache_dir=None):
+        super().__init__(config=config, response_cache_dir=response_cache_dir)
         self.client = client
 
     def _call_provider(
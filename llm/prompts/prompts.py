@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from schemas.pydantic.input.problem import *
 from schemas.pydantic.input.peer_review_input import PeerReviewInput
 from schemas.pydantic.input.solution_refinement_input import SolutionRefinementInput
@@ -7,7 +9,6 @@ from schemas.pydantic.output.problem_solution import *
 from schemas.pydantic.output.problem_solution_review import *
 from schemas.utilities.pydantic_schema_utils import PydanticSchemaUtils
 
-import json
 
 DEFAULT_SOLVER_POLICY = """
     You are a general-purpose problem solver.
@@ -143,7 +144,7 @@ def build_role_determination_user_prompt(problem: Problem) -> str:
     Problem input as JSON.
     """
 
-    problem_json = problem.model_dump(mode="json")
+    problem_json = problem.model_dump_json(indent=2)
 
     return f"""
 <user_input>
@@ -153,13 +154,19 @@ def build_role_determination_user_prompt(problem: Problem) -> str:
   You must rely ONLY on this JSON to determine the role scores for given problem
 
   <problem>  
-  {json.dumps(problem_json, indent=2, ensure_ascii=False)}
+  {problem_json}
   </problem>
 </user_input>
 """.strip()
 
 
+@lru_cache(maxsize=64)
 def build_solver_system_prompt(*, category: str) -> str:
+    """
+    Cached per category: every solver of every problem in a category
+    gets the byte-identical system prompt, a stable prefix for
+    provider-side prompt caching.
+    """
     policy = SOLVER_PROMPT_BY_CATEGORY.get(category, DEFAULT_SOLVER_POLICY)
 
     return f"""
@@ -250,7 +257,7 @@ def build_solver_user_prompt(problem: Problem) -> str:
     Problem input as JSON.
     """
 
-    problem_json = problem.model_dump(mode="json")
+    problem_json = problem.model_dump_json(indent=2)
 
     return f"""
 <user_input>
@@ -260,7 +267,7 @@ def build_solver_user_prompt(problem: Problem) -> str:
   You must rely ONLY on this JSON to solve the problem.
    
   <problem>  
-  {json.dumps(problem_json, indent=2, ensure_ascii=False)}
+  {problem_json}
   </problem>
 </user_input>
 """.strip()
@@ -346,16 +353,36 @@ PEER_REVIEW_SYSTEM_PROMPT = f"""
 """.strip()
 
 
+def build_peer_review_problem_json(problem: Problem) -> str:
+    """
+    Problem part of the peer-review input, indented as nested under
+    ReviewInput. Identical for every review of a problem, so callers
+    may build it once and pass it to build_peer_review_user_prompt.
+    """
+    return problem.model_dump_json(indent=2).replace("\n", "\n  ")
+
+
 def build_peer_review_user_prompt(
-    *, problem: Problem, solution: ProblemSolution
+    *,
+    problem: Problem,
+    solution: ProblemSolution,
+    problem_json: str | None = None,
 ) -> str:
     """
     Build peer-review user prompt for one reviewer → one reviewee.
     JSON-based, data-only prompt with indexed reasoning steps.
+
+    Renders the same JSON as PeerReviewInput(problem, solution)
+    .model_dump_json(indent=2), reusing problem_json when given.
     """
 
-    review_input = PeerReviewInput(problem=problem, solution=solution)
-    review_input_json = review_input.model_dump(mode="json")
+    if problem_json is None:
+        problem_json = build_peer_review_problem_json(problem)
+    solution_json = solution.model_dump_json(indent=2).replace("\n", "\n  ")
+
+    review_input_json = (
+        f'{{\n  "problem": {problem_json},\n  "solution": {solution_json}\n}}'
+    )
 
     return f"""
     <user_input>
@@ -365,7 +392,7 @@ def build_peer_review_user_prompt(
       You must rely ONLY on this JSON to review the problem solution
 
       <ReviewInput>  
-        {json.dumps(review_input_json, indent=2, ensure_ascii=False)}
+        {review_input_json}
       </ReviewInput>
     </user_input>
     """.strip()
@@ -473,7 +500,7 @@ def build_solution_refinement_user_prompt(
     solution_refinement_input = SolutionRefinementInput(
         problem=problem, solution=initial_solution, reviews=reviews
     )
-    solution_refinement_input_json = solution_refinement_input.model_dump(mode="json")
+    solution_refinement_input_json = solution_refinement_input.model_dump_json(indent=2)
 
     return f"""
     <user_input>
@@ -483,7 +510,7 @@ def build_solution_refinement_user_prompt(
       You must rely ONLY on this JSON to refine the problem solution.
 
       <SolutionRefinementInput>  
-        {json.dumps(solution_refinement_input_json, indent=2, ensure_ascii=False)}
+        {solution_refinement_input_json}
       </SolutionRefinementInput>
     </user_input>
     """.strip()
@@ -603,7 +630,7 @@ def build_final_judgement_user_prompt(
     *,
     final_input: FinalJudgementInput,
 ) -> str:
-    final_input_json = final_input.model_dump(mode="json")
+    final_input_json = final_input.model_dump_json(indent=2)
 
     return f"""
 <user_input>
@@ -613,7 +640,7 @@ def build_final_judgement_user_prompt(
   You must rely ONLY on this JSON to perform the judgment.
 
   <FinalJudgementInput>
-  {json.dumps(final_input_json, indent=2, ensure_ascii=False)}
+  {final_input_json}
   </FinalJudgementInput>
 </user_input>
 """.strip()
@@ -646,7 +673,7 @@ ANSWER_CORRECTNESS_PROMPT = """
 def build_final_judgement_user_prompt(
     comparison: AnswerComparisonInput,
 ) -> str:
-    comparison_json = comparison.model_dump(mode="json")
+    comparison_json = comparison.model_dump_json(indent=2)
 
     return f"""
 <task>
@@ -658,7 +685,7 @@ def build_final_judgement_user_prompt(
   Determine whether the solution answer is correct (contextually same as grounding answer).
 
   <AnswerComparisonInput>
-  {json.dumps(comparison_json, indent=2, ensure_ascii=False)}
+  {comparison_json}
   </AnswerComparisonInput>
 </user_input>
 """.strip()
@@ -668,7 +695,7 @@ def build_final_judgement_user_prompt(
     *,
     final_input: FinalJudgementInput,
 ) -> str:
-    final_input_json = final_input.model_dump(mode="json")
+    final_input_json = final_input.model_dump_json(indent=2)
 
     return f"""
 <user_input>
@@ -678,7 +705,7 @@ def build_final_judgement_user_prompt(
   You must rely ONLY on this JSON to perform the judgment.
 
   <FinalJudgementInput>
-  {json.dumps(final_input_json, indent=2, ensure_ascii=False)}
+  {final_input_json}
   </FinalJudgementInput>
 </user_input>
 """.strip()
\ No newline at end of file
@@ -4,66 +4,70 @@ from config import *
 from runtime.app import ProblemSolvingApp
 from schemas.dataclass.agent_config import LLMAgentConfig
 
-def create_llm_configs():
-    """
-    2 OpenAI + 2 Gemini agents with different reasoning styles.
-    """
-    return [
-        # -----------------
-        # OpenAI
-        # -----------------
+LLM_CONFIGS: tuple[LLMAgentConfig, ...] = (
+    # -----------------
+    # OpenAI
+    # -----------------
 
-        LLMAgentConfig(
-            provider="gemini",
-            llm_id="gemini-3-pro-1",
-            model="gemini-3-pro-preview",
-            temperature=0.6,
-            top_p=0.9,
-        ),
-        LLMAgentConfig(
-            provider="gemini",
-            llm_id="gemini-3-flash-1",
-            model="gemini-3-flash-preview",
-            temperature=0.3,
-            top_p=0.95,
-        ),
+    LLMAgentConfig(
+        provider="gemini",
+        llm_id="gemini-3-pro-1",
+        model="gemini-3-pro-preview",
+        temperature=0.6,
+        top_p=0.9,
+    ),
+    LLMAgentConfig(
+        provider="gemini",
+        llm_id="gemini-3-flash-1",
+        model="gemini-3-flash-preview",
+        temperature=0.3,
+        top_p=0.95,
+    ),
 
-        # -----------------
-        # Gemini
-        # -----------------
-        LLMAgentConfig(
-            provider="gemini",
-            llm_id="gemini-3-pro",
-            model="gemini-3-pro-preview",
-            temperature=0.3,
-            top_p=0.9,
-        ),
-        LLMAgentConfig(
-            provider="gemini",
-            llm_id="gemini-3-flash",
-            model="gemini-3-flash-preview",
-            temperature=0.8,
-            top_p=0.95,
-        ),
+    # -----------------
+    # Gemini
+    # -----------------
+    LLMAgentConfig(
+        provider="gemini",
+        llm_id="gemini-3-pro",
+        model="gemini-3-pro-preview",
+        temperature=0.3,
+        top_p=0.9,
+    ),
+    LLMAgentConfig(
+        provider="gemini",
+        llm_id="gemini-3-flash",
+        model="gemini-3-flash-preview",
+        temperature=0.8,
+        top_p=0.95,
+    ),
 
-        # -----------------
-        # # DeepSeek
-        # # -----------------
-        # LLMAgentConfig(
-        #     provider="deepseek",
-        #     llm_id="deepseek-chat",
-        #     model="deepseek-chat",
-        #     temperature=0.3,
-        #     top_p=0.9,
-        # ),
-        # LLMAgentConfig(
-        #     provider="deepseek",
-        #     llm_id="deepseek-reasoner",
-        #     model="deepseek-reasoner",
-        #     temperature=0.5,
-        #     top_p=0.95,
-        # ),
-    ]
+    # -----------------
+    # # DeepSeek
+    # # -----------------
+    # LLMAgentConfig(
+    #     provider="deepseek",
+    #     llm_id="deepseek-chat",
+    #     model="deepseek-chat",
+    #     temperature=0.3,
+    #     top_p=0.9,
+    # ),
+    # LLMAgentConfig(
+    #     provider="deepseek",
+    #     llm_id="deepseek-reasoner",
+    #     model="deepseek-reasoner",
+    #     temperature=0.5,
+    #     top_p=0.95,
+    # ),
+)
+
+
+def create_llm_configs() -> tuple[LLMAgentConfig, ...]:
+    """
+    2 OpenAI + 2 Gemini agents with different reasoning styles.
+    Built once at import; configs are frozen, so the tuple is shared.
+    """
+    return LLM_CONFIGS
 
 
 async def main():
@@ -73,6 +77,9 @@ async def main():
         problems_skip=PROBLEMS_SKIP,
         problems_take=PROBLEMS_TAKE,
         output_dir=Path(DEFAULT_OUTPUT_DIR),
+        response_cache_dir=(
+            Path(LLM_RESPONSE_CACHE_DIR) if LLM_RESPONSE_CACHE_DIR else None
+        ),
     )
 
     await app.run(
@@ -1,10 +1,10 @@
-import json
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 import uuid
 import asyncio
 
 from dotenv import load_dotenv
+import orjson
 
 from llm.agents.agent import LLMAgent
 from llm.agents.agent_factory import AgentFactory
@@ -13,7 +13,10 @@ from schemas.dataclass.agent_config import LLMAgentConfig
 from data.persistence.firestore_client import get_firestore_client
 from data.persistence.firestore_manager import FirestoreManager
 
-from runtime.problem_solving_session import ProblemSolvingSession
+from runtime.problem_solving_session import (
+    ProblemSolvingSession,
+    build_llm_semaphores,
+)
 
 
 class ProblemSolvingApp:
@@ -27,10 +30,11 @@ class ProblemSolvingApp:
         self,
         *,
         problems_path: Path,
-        agent_configs: List[LLMAgentConfig],
+        agent_configs: Sequence[LLMAgentConfig],
         problems_skip: int = 0,
         problems_take: int | None = None,
         output_dir: Path = Path("data/output"),
+        response_cache_dir: Path | None = None,
     ):
         self.run_id = uuid.uuid4().hex
 
@@ -40,6 +44,7 @@ class ProblemSolvingApp:
 
         self.agent_configs = agent_configs
         self.output_dir = output_dir
+        self.response_cache_dir = response_cache_dir
 
         self.problems: List[Problem] = []
         self.agents: List[LLMAgent] = []
@@ -50,20 +55,22 @@ class ProblemSolvingApp:
     # Setup
     # -------------------------
     def load_problems(self) -> None:
-        raw = json.loads(self.problems_path.read_text())
-
-        problems = [Problem.model_validate(p) for p in raw]
+        raw = orjson.loads(self.problems_path.read_bytes())
 
+        # slice before validating so skipped problems are never built
         if self.problems_skip:
-            problems = problems[self.problems_skip :]
+            raw = raw[self.problems_skip :]
 
         if self.problems_take is not None:
-            problems = problems[: self.problems_take]
+            raw = raw[: self.problems_take]
 
-        self.problems = problems
+        self.problems = Problem.from_records(raw)
 
     def create_agents(self) -> None:
-        self.agents = AgentFactory.create_agents(self.agent_configs)
+        self.agents = AgentFactory.create_agents(
+            self.agent_configs,
+            response_cache_dir=self.response_cache_dir,
+        )
 
     # -------------------------
     # Main entry point
@@ -74,6 +81,7 @@ class ProblemSolvingApp:
         timeout_sec: int,
         log_interval_sec: int,
         max_concurrent_sessions: int = 2,
+        llm_concurrency_per_agent: int = 4,
     ) -> None:
         load_dotenv()
 
@@ -86,6 +94,12 @@ class ProblemSolvingApp:
 
         semaphore = asyncio.Semaphore(max_concurrent_sessions)
 
+        # shared by all sessions, so per-agent limits hold across problems
+        # and one problem's reviews can use slots another isn't using
+        llm_sems = build_llm_semaphores(
+            self.agents, concurrency_per_agent=llm_concurrency_per_agent
+        )
+
         print(
             f"\n[RUN START] "
             f"run_id={self.run_id} "
@@ -109,6 +123,7 @@ class ProblemSolvingApp:
                     agents=self.agents,
                     firestore_manager=firestore_manager,
                     output_dir=self.output_dir,
+                    llm_sems=llm_sems,
                 )
 
                 await session.run(
@@ -123,11 +138,24 @@ class ProblemSolvingApp:
                     f"==========\n"
                 )
 
-        tasks = [
-            asyncio.create_task(run_single_problem(idx, problem))
-            for idx, problem in enumerate(self.problems, start=1)
-        ]
-
-        await asyncio.gather(*tasks)
+        # sessions only enqueue their Firestore writes; land them all
+        # (including those of failed sessions) and raise any failed commits
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for idx, problem in enumerate(self.problems, start=1):
+                    tg.create_task(run_single_problem(idx, problem))
+        except BaseException as e:
+            # the session error stays the one raised; write failures ride along
+            try:
+                await firestore_manager.flush()
+            except ExceptionGroup as write_errors:
+                e.add_note(
+                    f"Firestore writes also failed "
+                    f"({len(write_errors.exceptions)}): "
+                    + "; ".join(dict.fromkeys(repr(w) for w in write_errors.exceptions))
+                )
+            raise
+        else:
+            await firestore_manager.flush()
 
         print(f"\n[RUN END] run_id={self.run_id}\n")
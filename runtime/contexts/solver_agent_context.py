@@ -1,5 +1,8 @@
+import asyncio
 from pathlib import Path
-import uuid
+import os
+import random
+import time
 from typing import Optional
 
 from llm.agents.agent import LLMAgent
@@ -21,6 +24,18 @@ from llm.prompts.prompts import (
 )
 
 
+# seeded once from the OS; ids only need to be unique within a run
+_RNG = random.Random(os.urandom(16))
+
+
+def _fast_id() -> str:
+    """
+    32-char hex id: nanosecond timestamp + 64 random bits.
+    Sorts chronologically and avoids a urandom syscall per id.
+    """
+    return f"{time.time_ns():016x}{_RNG.getrandbits(64):016x}"
+
+
 class SolverAgentContext:
     """
     Holds all solver-related state and behavior
@@ -45,7 +60,11 @@ class SolverAgentContext:
         self.peer_reviews: list[ProblemSolutionReview] = []
         self.refined_solution: Optional[RefinedProblemSolution] = None
 
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # let the session start reviews / refinement per solver
+        # instead of waiting for a whole stage to finish
+        self.solution_ready = asyncio.Event()
+        self.reviews_ready = asyncio.Event()
+        self.expected_reviews = 0
 
     @property
     def solver_id(self) -> str:
@@ -59,13 +78,16 @@ class SolverAgentContext:
         *,
         timeout_sec: int,
         log_interval_sec: int,
+        user_prompt: Optional[str] = None,
     ) -> RoleAssessment:
         """
         Performs LLM role self-assessment for this agent.
+        user_prompt may be prebuilt once per problem and shared by agents.
         """
 
         system_prompt = ROLE_DETERMINATION_SYSTEM_PROMPT
-        user_prompt  = build_role_determination_user_prompt(self.problem)
+        if user_prompt is None:
+            user_prompt = build_role_determination_user_prompt(self.problem)
 
         assessment = await self.agent.run_structured_call(
             problem=self.problem,
@@ -81,7 +103,7 @@ class SolverAgentContext:
         assessment.prompt_user = user_prompt
         assessment.llm_id = self.solver_id
         assessment.run_id = self.run_id
-        assessment.assessment_id = uuid.uuid4().hex
+        assessment.assessment_id = _fast_id()
         assessment.problem_id = self.problem.problem_id
 
         self.role_assessment = assessment
@@ -95,10 +117,18 @@ class SolverAgentContext:
         *,
         timeout_sec: int,
         log_interval_sec: int,
+        system_prompt: Optional[str] = None,
+        user_prompt: Optional[str] = None,
     ) -> ProblemSolution:
+        """
+        Solves the problem. Prompts may be prebuilt once per problem
+        and shared by all solvers.
+        """
 
-        system_prompt = build_solver_system_prompt(category=self.problem.category)
-        user_prompt  = build_solver_user_prompt(self.problem)
+        if system_prompt is None:
+            system_prompt = build_solver_system_prompt(category=self.problem.category)
+        if user_prompt is None:
+            user_prompt = build_solver_user_prompt(self.problem)
 
         solution = await self.agent.run_structured_call(
             problem=self.problem,
@@ -114,10 +144,11 @@ class SolverAgentContext:
         solution.prompt_user = user_prompt
         solution.run_id = self.run_id
         solution.solver_llm_model_id = self.solver_id
-        solution.solution_id = uuid.uuid4().hex
+        solution.solution_id = _fast_id()
         solution.problem_id = self.problem.problem_id
 
         self.solution = solution
+        self.solution_ready.set()
         return solution
 
     # -------------------------
@@ -129,12 +160,18 @@ class SolverAgentContext:
         solution: ProblemSolution,
         timeout_sec: int,
         log_interval_sec: int,
+        problem_json: Optional[str] = None,
     ) -> ProblemSolutionReview:
+        """
+        Reviews another solver's solution. problem_json may be prebuilt
+        once per problem (build_peer_review_problem_json) and shared.
+        """
 
         system_prompt = PEER_REVIEW_SYSTEM_PROMPT
         user_prompt = build_peer_review_user_prompt(
                 problem=self.problem,
                 solution=solution,
+                problem_json=problem_json,
             )
 
         review = await self.agent.run_structured_call(
@@ -149,7 +186,7 @@ class SolverAgentContext:
 
         review.prompt_system = system_prompt
         review.prompt_user = user_prompt
-        review.review_id = uuid.uuid4().hex
+        review.review_id = _fast_id()
         review.run_id = self.run_id
         review.problem_id = self.problem.problem_id
         review.reviewer_id = self.solver_id
@@ -158,6 +195,13 @@ class SolverAgentContext:
 
         return review
 
+    def expect_reviews(self, count: int) -> None:
+        self.expected_reviews = count
+
+        # nothing to wait for: let refinement run (and skip) immediately
+        if count == 0:
+            self.reviews_ready.set()
+
     def receive_review(
         self,
         *,
@@ -172,6 +216,9 @@ class SolverAgentContext:
 
         self.peer_reviews.append(review)
 
+        if len(self.peer_reviews) >= self.expected_reviews:
+            self.reviews_ready.set()
+
     # -------------------------
     # Stage 3: Refinement
     # -------------------------
@@ -204,7 +251,7 @@ class SolverAgentContext:
         refined_solution.run_id = self.run_id
         refined_solution.solver_llm_model_id = self.solver_id
         refined_solution.parent_solution_id = self.solution.solution_id
-        refined_solution.refined_solution_id = uuid.uuid4().hex
+        refined_solution.refined_solution_id = _fast_id()
         refined_solution.problem_id = self.problem.problem_id
         refined_solution.review_ids = [
             r.review_id for r in self.peer_reviews if r.review_id
@@ -1,6 +1,10 @@
 import asyncio
+import heapq
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import orjson
 
 from llm.agents.agent import LLMAgent
 from schemas.pydantic.output.role_assessment import RoleAssessment
@@ -22,6 +26,28 @@ from runtime.contexts.judge_agent_context import JudgeAgentContext
 from llm.prompts.prompts import *
 
 
+def _dump_json(file_path: Path, document: Dict[str, Any]) -> None:
+    """
+    Serializes and writes a session document; runs on a worker thread
+    so neither step blocks the event loop.
+    """
+    file_path.write_bytes(orjson.dumps(document, option=orjson.OPT_INDENT_2))
+
+
+def build_llm_semaphores(
+    agents: List[LLMAgent],
+    *,
+    concurrency_per_agent: int,
+) -> Dict[str, asyncio.Semaphore]:
+    """
+    One semaphore per agent (keyed by llm_id) limiting its in-flight calls.
+    """
+    return {
+        a.config.llm_id: asyncio.Semaphore(concurrency_per_agent)
+        for a in agents
+    }
+
+
 class ProblemSolvingSession:
     """
     Executes a full debate for a single problem.
@@ -35,19 +61,47 @@ class ProblemSolvingSession:
         agents: List[LLMAgent],
         firestore_manager: FirestoreManager,
         output_dir: Path,
-        max_concurrency: int = 6,
+        llm_concurrency_per_agent: int = 4,
+        io_concurrency: int = 8,
+        llm_sems: Optional[Dict[str, asyncio.Semaphore]] = None,
     ):
         self.run_id = run_id
         self.problem = problem
         self.agents = agents
         self.firestore_manager = firestore_manager
         self.output_dir = output_dir
-        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # LLM slots and file I/O are limited separately, so a slow disk
+        # write never holds back an agent call and vice versa.
+        # LLM slots are per agent: each agent has its own client, so one
+        # agent's backlog must not hold back calls to the others.
+        # Concurrent sessions pass a shared llm_sems so the limit holds
+        # across problems; otherwise the session builds its own.
+        if llm_sems is None:
+            llm_sems = build_llm_semaphores(
+                agents, concurrency_per_agent=llm_concurrency_per_agent
+            )
+        self.llm_sems: Dict[str, asyncio.Semaphore] = llm_sems
+        self.io_sem = asyncio.Semaphore(io_concurrency)
 
         self.solver_contexts: List[SolverAgentContext] = []
+        self._review_pairs: List[Tuple[SolverAgentContext, SolverAgentContext]] = []
         self.judge_context: Optional[JudgeAgentContext] = None
 
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # created once here rather than by every stage / task
+        self.assessment_dir = self.output_dir / "role_assessments"
+        self.solutions_dir = self.output_dir / "solutions"
+        self.review_dir = self.output_dir / "reviews"
+        self.refined_dir = self.output_dir / "refined_solutions"
+        self.judgement_dir = self.output_dir / "final_judgements"
+
+        for stage_dir in (
+            self.assessment_dir,
+            self.solutions_dir,
+            self.review_dir,
+            self.refined_dir,
+            self.judgement_dir,
+        ):
+            stage_dir.mkdir(parents=True, exist_ok=True)
 
     async def run(
         self,
@@ -65,17 +119,7 @@ class ProblemSolvingSession:
             log_interval_sec=log_interval_sec,
         )
 
-        await self._run_solvers(
-            timeout_sec=timeout_sec,
-            log_interval_sec=log_interval_sec,
-        )
-
-        await self._run_peer_reviews(
-            timeout_sec=timeout_sec,
-            log_interval_sec=log_interval_sec,
-        )
-
-        await self._run_refinements(
+        await self._run_solve_review_refine(
             timeout_sec=timeout_sec,
             log_interval_sec=log_interval_sec,
         )
@@ -87,16 +131,45 @@ class ProblemSolvingSession:
 
         print(f"[SESSION END] problem={self.problem.problem_id}")
 
-    async def _persist_run(self):
+    async def _persist_run(self) -> None:
         document = {
             "run_id": self.run_id,
             "timestamp": datetime.now(),
         }
 
-        await self.firestore_manager.write(
-            collection=RUNS, document=document, document_id=self.run_id
+        await self._enqueue_writes(
+            collection=RUNS, documents=[(self.run_id, document)]
         )
 
+    # -------------------------
+    # Firestore writes
+    # -------------------------
+    async def _enqueue_writes(
+        self,
+        *,
+        collection: str,
+        documents: List[Tuple[str, Dict[str, Any]]],
+    ) -> None:
+        """
+        Hands (document_id, document) pairs to the manager's background
+        writer, so stages never wait on Firestore commits, only on a full
+        queue. Stages enqueue each document as soon as it is produced;
+        the writer batches whatever is pending per collection. The app
+        flushes the manager once all sessions are done.
+        """
+        await self.firestore_manager.enqueue_many(
+            collection=collection,
+            documents=documents,
+        )
+
+    async def _write_json_file(
+        self,
+        file_path: Path,
+        document: Dict[str, Any],
+    ) -> None:
+        async with self.io_sem:
+            await asyncio.to_thread(_dump_json, file_path, document)
+
     # -------------------------
     # Stage 0: Role assignment
     # -------------------------
@@ -109,9 +182,6 @@ class ProblemSolvingSession:
 
         print("[ROLE ASSESSMENT START]")
 
-        assessment_dir = self.output_dir / "role_assessments"
-        assessment_dir.mkdir(parents=True, exist_ok=True)
-
         contexts = [
             SolverAgentContext(
                 agent=a,
@@ -122,40 +192,44 @@ class ProblemSolvingSession:
             for a in self.agents
         ]
 
+        # identical for every agent, so build it once per problem
+        user_prompt = build_role_determination_user_prompt(self.problem)
+
         async def assess(ctx: SolverAgentContext) -> RoleAssessment:
-            async with self.semaphore:
+            async with self.llm_sems[ctx.solver_id]:
                 assessment = await ctx.assess_role(
                     timeout_sec=timeout_sec,
                     log_interval_sec=log_interval_sec,
+                    user_prompt=user_prompt,
                 )
 
-                document = PydanticSchemaUtils.build_full_document(assessment)
+            document = PydanticSchemaUtils.build_full_document(assessment)
 
-                await self.firestore_manager.write(
-                    collection=ROLE_ASSESSMENTS,
-                    document=document,
-                    document_id=assessment.assessment_id,
-                )
+            # queued right away so finished work survives a failing sibling
+            await self._enqueue_writes(
+                collection=ROLE_ASSESSMENTS,
+                documents=[(assessment.assessment_id, document)],
+            )
 
-                file_path = (
-                    assessment_dir / f"{assessment.llm_id}_{assessment.problem_id}.json"
-                )
+            file_path = (
+                self.assessment_dir / f"{assessment.llm_id}_{assessment.problem_id}.json"
+            )
 
-                file_path.write_text(
-                    json.dumps(document, indent=2, ensure_ascii=False),
-                    encoding="utf-8",
-                )
+            await self._write_json_file(file_path, document)
+
+            return assessment
 
-                return assessment
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(assess(c)) for c in contexts]
 
-        results = await asyncio.gather(*[assess(c) for c in contexts])
+        results = [t.result() for t in tasks]
 
         def overall_capability(a: RoleAssessment) -> float:
             """Pick the 4 most capable agents regardless of role preference"""
             return max(a.judge_score, a.solver_score)
 
-        results.sort(key=overall_capability, reverse=True)
-        top_4 = results[:4]
+        # same order as a full descending sort, without sorting everyone
+        top_4 = heapq.nlargest(4, results, key=overall_capability)
 
         if len(top_4) < 4:
             raise RuntimeError(f"Need at least 4 agents, got {len(results)}")
@@ -198,155 +272,131 @@ class ProblemSolvingSession:
         # preserve solver ordering as Solver 1/2/3
         self.solver_contexts = solver_contexts
 
+        # (reviewer, reviewee) for every ordered pair of distinct solvers
+        self._review_pairs = [
+            (r, e)
+            for i, r in enumerate(solver_contexts)
+            for j, e in enumerate(solver_contexts)
+            if i != j
+        ]
+
         # now inject solver contexts into judge
         self.judge_context.solver_contexts = self.solver_contexts
 
     # -------------------------
-    # Stage 1: Solving
+    # Stages 1-3: Solve, peer review, refine
     # -------------------------
-    async def _run_solvers(
+    async def _run_solve_review_refine(
         self,
         *,
         timeout_sec: int,
         log_interval_sec: int,
     ) -> None:
+        """
+        Runs solving, peer review and refinement as one task graph.
+        A review starts as soon as its reviewee's solution is ready and a
+        refinement as soon as all of its reviews are in, so no stage waits
+        for the slowest solver of the previous one.
+        """
+
+        # identical for every solver, so build them once per problem
+        system_prompt = build_solver_system_prompt(category=self.problem.category)
+        user_prompt = build_solver_user_prompt(self.problem)
+        review_problem_json = build_peer_review_problem_json(self.problem)
+
+        if len(self.solver_contexts) < 2:
+            print("[PEER REVIEW SKIPPED] Not enough solvers")
+
+        for ctx in self.solver_contexts:
+            ctx.expect_reviews(sum(1 for _, e in self._review_pairs if e is ctx))
 
         async def solve(ctx: SolverAgentContext) -> None:
-            async with self.semaphore:
+            async with self.llm_sems[ctx.solver_id]:
                 solution = await ctx.solve(
                     timeout_sec=timeout_sec,
                     log_interval_sec=log_interval_sec,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
                 )
 
-                document = PydanticSchemaUtils.build_full_document(solution)
-
-                await self.firestore_manager.write(
-                    collection=SOLUTIONS,
-                    document=document,
-                    document_id=solution.solution_id,
-                )
-
-                solutions_dir = self.output_dir / "solutions"
-                solutions_dir.mkdir(parents=True, exist_ok=True)
+            document = PydanticSchemaUtils.build_full_document(solution)
 
-                file_path = (
-                    solutions_dir / f"{ctx.solver_id}_{self.problem.problem_id}.json"
-                )
-
-                file_path.write_text(
-                    json.dumps(document, indent=2, ensure_ascii=False),
-                    encoding="utf-8",
-                )
-
-        await asyncio.gather(*[solve(ctx) for ctx in self.solver_contexts])
-
-    # -------------------------
-    # Stage 2: Peer review
-    # -------------------------
-    async def _run_peer_reviews(
-        self,
-        *,
-        timeout_sec: int,
-        log_interval_sec: int,
-    ) -> None:
-
-        if len(self.solver_contexts) < 2:
-            print("[PEER REVIEW SKIPPED] Not enough solvers")
-            return
+            await self._enqueue_writes(
+                collection=SOLUTIONS,
+                documents=[(solution.solution_id, document)],
+            )
 
-        print("[PEER REVIEW START]")
+            file_path = (
+                self.solutions_dir / f"{ctx.solver_id}_{self.problem.problem_id}.json"
+            )
 
-        review_dir = self.output_dir / "reviews"
-        review_dir.mkdir(parents=True, exist_ok=True)
+            await self._write_json_file(file_path, document)
 
         async def review(
             reviewer: SolverAgentContext,
             reviewee: SolverAgentContext,
         ) -> None:
-            async with self.semaphore:
+            await reviewee.solution_ready.wait()
+
+            async with self.llm_sems[reviewer.solver_id]:
                 review: ProblemSolutionReview = await reviewer.generate_review(
                     solution=reviewee.solution,
                     timeout_sec=timeout_sec,
                     log_interval_sec=log_interval_sec,
+                    problem_json=review_problem_json,
                 )
 
-                reviewee.receive_review(review=review)
-
-                document = PydanticSchemaUtils.build_full_document(review)
-
-                await self.firestore_manager.write(
-                    collection=SOLUTION_REVIEWS,
-                    document=document,
-                    document_id=review.review_id,
-                )
-
-                solutions_dir = self.output_dir / "reviews"
-                solutions_dir.mkdir(parents=True, exist_ok=True)
+            reviewee.receive_review(review=review)
 
-                file_path = (
-                    solutions_dir
-                    / f"{review.reviewer_id}_{review.reviewee_id}_{self.problem.problem_id}.json"
-                )
-
-                file_path.write_text(
-                    json.dumps(document, indent=2, ensure_ascii=False),
-                    encoding="utf-8",
-                )
-
-        await asyncio.gather(
-            *[
-                review(r, e)
-                for r in self.solver_contexts
-                for e in self.solver_contexts
-                if r.solver_id != e.solver_id
-            ]
-        )
-
-        print("[PEER REVIEW COMPLETE]")
+            document = PydanticSchemaUtils.build_full_document(review)
 
-    async def _run_refinements(
-        self,
-        *,
-        timeout_sec: int,
-        log_interval_sec: int,
-    ) -> None:
+            await self._enqueue_writes(
+                collection=SOLUTION_REVIEWS,
+                documents=[(review.review_id, document)],
+            )
 
-        print("[REFINEMENT START]")
+            file_path = (
+                self.review_dir
+                / f"{review.reviewer_id}_{review.reviewee_id}_{self.problem.problem_id}.json"
+            )
 
-        refined_dir = self.output_dir / "refined_solutions"
-        refined_dir.mkdir(parents=True, exist_ok=True)
+            await self._write_json_file(file_path, document)
 
         async def refine(ctx: SolverAgentContext) -> None:
-            async with self.semaphore:
-                if not ctx.peer_reviews:
-                    print(
-                        f"[REFINEMENT SKIPPED] solver={ctx.solver_id} (no peer reviews)"
-                    )
-                    return
+            await ctx.reviews_ready.wait()
+
+            if not ctx.peer_reviews:
+                print(
+                    f"[REFINEMENT SKIPPED] solver={ctx.solver_id} (no peer reviews)"
+                )
+                return
 
+            async with self.llm_sems[ctx.solver_id]:
                 refined_solution: RefinedProblemSolution = await ctx.refine_solution(
                     timeout_sec=timeout_sec,
                     log_interval_sec=log_interval_sec,
                 )
 
-                document = PydanticSchemaUtils.build_full_document(refined_solution)
+            document = PydanticSchemaUtils.build_full_document(refined_solution)
 
-                await self.firestore_manager.write(
-                    collection=REFINED_SOLUTIONS,
-                    document=document,
-                    document_id=refined_solution.refined_solution_id,
-                )
+            await self._enqueue_writes(
+                collection=REFINED_SOLUTIONS,
+                documents=[(refined_solution.refined_solution_id, document)],
+            )
 
-                file_path = (
-                    refined_dir / f"{ctx.solver_id}_{ctx.problem.problem_id}.json"
-                )
+            file_path = (
+                self.refined_dir / f"{ctx.solver_id}_{ctx.problem.problem_id}.json"
+            )
 
-                file_path.write_text(
-                    json.dumps(document, indent=2, ensure_ascii=False),
-                    encoding="utf-8",
-                )
+            await self._write_json_file(file_path, document)
 
-        await asyncio.gather(*[refine(ctx) for ctx in self.solver_contexts])
+        async with asyncio.TaskGroup() as tg:
+            for ctx in self.solver_contexts:
+                tg.create_task(solve(ctx))
+            for r, e in self._review_pairs:
+                tg.create_task(review(r, e))
+            for ctx in self.solver_contexts:
+                tg.create_task(refine(ctx))
 
         print("[REFINEMENT COMPLETE]")
 
@@ -370,24 +420,17 @@ class ProblemSolvingSession:
 
         document = PydanticSchemaUtils.build_full_document(judgement)
 
-        await self.firestore_manager.write(
+        await self._enqueue_writes(
             collection=FINAL_JUDGEMENTS,
-            document=document,
-            document_id=judgement.judgement_id,
+            documents=[(judgement.judgement_id, document)],
         )
 
-        judgement_dir = self.output_dir / "final_judgements"
-        judgement_dir.mkdir(parents=True, exist_ok=True)
-
         file_path = (
-            judgement_dir
+            self.judgement_dir
             / f"{self.judge_context.judge_id}_{self.problem.problem_id}.json"
         )
 
-        file_path.write_text(
-            json.dumps(document, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        await self._write_json_file(file_path, document)
 
         winner_index = int(judgement.winner_solver.split()[-1]) - 1
         winner_ctx = self.solver_contexts[winner_index]
@@ -1,8 +1,11 @@
-from typing import Dict, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class Problem(BaseModel):
+    # loaded once and shared read-only by every session; frozen also makes it hashable
+    model_config = ConfigDict(frozen=True)
+
     prompt_system: str | None = Field(
         default=None,
         exclude=True,
@@ -49,28 +52,12 @@ class Problem(BaseModel):
     )
 
     @classmethod
-    def from_dict(cls, data: Dict) -> "Problem":
+    def from_records(cls, records: List[Dict]) -> List["Problem"]:
         """
-        Construct a Problem from a raw dictionary (e.g., dataset JSON).
+        Validate a list of problem records (dataset field names)
+        in a single pydantic-core pass instead of one call per record.
         """
-        return cls(
-            problem_id=data["id"],
-            category=data["category"],
-            subcategory=data.get("subcategory"),
-            statement=data["problem_statement"],
-            ground_answer=data["ground_answer"],
-            difficulty=data["difficulty"],
-        )
+        return _PROBLEM_LIST_ADAPTER.validate_python(records)
 
-    def to_dict(self) -> Dict:
-        """
-        Serialize the Problem into a dictionary for storage or transport.
-        """
-        return {
-            "id": self.problem_id,
-            "category": self.category,
-            "subcategory": self.subcategory,
-            "problem_statement": self.statement,
-            "ground_answer": self.ground_answer,
-            "difficulty": self.difficulty,
-        }
+
+_PROBLEM_LIST_ADAPTER = TypeAdapter(List[Problem])
@@ -1,4 +1,5 @@
-from typing import Any, Dict, Type, Set
+from functools import lru_cache
+from typing import Any, Dict, Type, Set, Tuple
 from pydantic import BaseModel
 import json
 
@@ -163,8 +164,8 @@ class PydanticSchemaUtils:
             exclude_none=False,
         )
 
-        # 2. Find which fields were excluded by schema
-        excluded_fields = PydanticSchemaUtils._collect_excluded_fields(model.__class__)
+        # 2. Find which fields were excluded by schema (cached per class)
+        excluded_fields = PydanticSchemaUtils._ordered_excluded_fields(model.__class__)
 
         # 3. Re-inject excluded fields from the instance
         for field_name in excluded_fields:
@@ -172,3 +173,15 @@ class PydanticSchemaUtils:
                 document[field_name] = getattr(model, field_name)
 
         return document
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _ordered_excluded_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+        """
+        Excluded field names in declaration order, computed once per
+        model class so documents get a stable key order.
+        """
+        excluded = PydanticSchemaUtils._collect_excluded_fields(model)
+        declared = [name for name in model.model_fields if name in excluded]
+
+        return tuple(declared + sorted(excluded.difference(declared)))